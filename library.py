@@ -1,6 +1,101 @@
-import json
+import functools
+import mmap
 import os
-from typing import List, Dict, Optional
+import sys
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
+
+import orjson
+
+try:
+    import numpy as np
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# Ниже этого размера библиотеки компилируемый проход по годам не окупается.
+_NUMBA_MIN_BOOKS = 10000
+
+# Интернированные статусы: сравнение сводится к проверке указателя,
+# а все книги разделяют один и тот же строковый объект.
+STATUS_AVAILABLE = sys.intern("в наличии")
+STATUS_ISSUED = sys.intern("выдана")
+
+MENU = "\n".join([
+    "",
+    "Меню:",
+    "1. Добавить книгу",
+    "2. Удалить книгу",
+    "3. Найти книгу",
+    "4. Показать все книги",
+    "5. Изменить статус книги",
+    "6. Выход",
+    "",
+])
+
+if _HAS_NUMBA:
+    @njit(cache=True)
+    def _year_mask(years, year):
+        """
+        Булева маска книг с заданным годом издания по массиву годов.
+        """
+        out = np.empty(years.size, np.bool_)
+        for i in range(years.size):
+            out[i] = years[i] == year
+        return out
+
+@functools.lru_cache(maxsize=128)
+def _find_cached(library_ref, version, title_lc, author_lc, year):
+    """
+    Кешированный поиск: идентификаторы книг по нормализованному запросу.
+
+    version входит в ключ кеша, поэтому любая мутация библиотеки
+    автоматически обесценивает старые записи.
+    """
+    library = library_ref()
+    if library is None:
+        return ()
+    return tuple(book.id for book in library.find_books(title_lc, author_lc, year))
+
+_FIND_CACHE: Dict[Tuple[bool, bool, bool], Callable] = {}
+
+def _find_scanner(need_title: bool, need_author: bool, need_year: bool) -> Callable:
+    """
+    Специализированный фильтр книг под конкретную форму запроса.
+
+    Для каждой комбинации активных условий однократно генерируется и
+    компилируется функция, содержащая только нужные проверки; повторные
+    запросы той же формы берут её из кеша.
+
+    Args:
+        need_title (bool): Фильтровать по названию.
+        need_author (bool): Фильтровать по автору.
+        need_year (bool): Фильтровать по году.
+
+    Returns:
+        Callable: Функция run(books, title_lc, author_lc, year) -> List[Book].
+    """
+    key = (need_title, need_author, need_year)
+    scanner = _FIND_CACHE.get(key)
+    if scanner is None:
+        conditions = []
+        if need_title:
+            conditions.append("title_lc in book._title_lc")
+        if need_author:
+            conditions.append("author_lc in book._author_lc")
+        if need_year:
+            conditions.append("book.year == year")
+        body = " and ".join(conditions) or "True"
+        src = (
+            "def run(books, title_lc, author_lc, year):\n"
+            f"    return [book for book in books if {body}]\n"
+        )
+        namespace = {}
+        exec(compile(src, "<find_scanner>", "exec"), namespace)
+        scanner = _FIND_CACHE[key] = namespace["run"]
+    return scanner
 
 class Book:
     """
@@ -14,7 +109,9 @@ class Book:
         status (str): Статус книги ("в наличии" или "выдана").
     """
 
-    def __init__(self, title: str, author: str, year: int, book_id: int, status: str = "в наличии"):
+    __slots__ = ("id", "title", "author", "year", "status", "_title_lc", "_author_lc", "_raw")
+
+    def __init__(self, title: str, author: str, year: int, book_id: int, status: str = STATUS_AVAILABLE):
         """
         Инициализация объекта книги.
 
@@ -25,11 +122,21 @@ class Book:
             book_id (int): Уникальный идентификатор книги.
             status (str, optional): Статус книги. По умолчанию "в наличии".
         """
+        status = sys.intern(status)
         self.id = book_id
         self.title = title
         self.author = author
         self.year = year
         self.status = status
+        self._title_lc = title.lower()
+        self._author_lc = author.lower()
+        self._raw = {
+            "id": book_id,
+            "title": title,
+            "author": author,
+            "year": year,
+            "status": status
+        }
 
     def to_dict(self) -> Dict:
         """
@@ -38,13 +145,18 @@ class Book:
         Returns:
             Dict: Словарь с данными книги.
         """
-        return {
-            "id": self.id,
-            "title": self.title,
-            "author": self.author,
-            "year": self.year,
-            "status": self.status
-        }
+        return self._raw
+
+    def set_status(self, status: str):
+        """
+        Изменение статуса книги с обновлением кешированного словаря.
+
+        Args:
+            status (str): Новый статус книги.
+        """
+        status = sys.intern(status)
+        self.status = status
+        self._raw["status"] = status
 
     @staticmethod
     def from_dict(data: Dict) -> 'Book':
@@ -57,7 +169,16 @@ class Book:
         Returns:
             Book: Объект книги.
         """
-        return Book(data["title"], data["author"], data["year"], data["id"], data["status"])
+        book = Book.__new__(Book)
+        book.id = data["id"]
+        book.title = data["title"]
+        book.author = data["author"]
+        book.year = data["year"]
+        book.status = data["status"] = sys.intern(data["status"])
+        book._title_lc = book.title.lower()
+        book._author_lc = book.author.lower()
+        book._raw = data
+        return book
 
 class Library:
     """
@@ -65,39 +186,92 @@ class Library:
 
     Атрибуты:
         storage_file (str): Имя файла для хранения данных.
-        books (List[Book]): Список книг в библиотеке.
+        mode (str): Формат хранения: "json" (массив) или "jsonl" (строка на книгу).
+        books (Dict[int, Book]): Книги библиотеки по идентификатору.
     """
 
-    def __init__(self, storage_file: str):
+    def __init__(self, storage_file: str, mode: str = "json"):
         """
         Инициализация объекта библиотеки и загрузка данных.
 
         Args:
             storage_file (str): Имя файла для хранения данных.
+            mode (str, optional): Формат хранения ("json" или "jsonl").
+                В режиме "jsonl" добавление книги дописывает одну строку
+                в конец файла вместо полной перезаписи.
         """
+        if mode not in ("json", "jsonl"):
+            raise ValueError(f"Неизвестный формат хранения: {mode}")
         self.storage_file = storage_file
-        self.books: List[Book] = []
+        self.mode = mode
+        self.books: Dict[int, Book] = {}
+        self._by_year: Dict[int, List[Book]] = {}
+        self._by_author_lc: Dict[str, List[Book]] = {}
+        self._years = None
+        self._max_id = 0
+        self._dirty = False
+        self._batch_depth = 0
+        self._version = 0
+        self._ref = weakref.ref(self)
         self.load_books()
 
     def load_books(self):
         """
         Загрузка данных о книгах из файла.
         """
-        if os.path.exists(self.storage_file):
-            try:
-                with open(self.storage_file, 'r', encoding='utf-8') as file:
-                    data = file.read().strip()
-                    if data:
-                        self.books = [Book.from_dict(book) for book in json.loads(data)]
-            except json.JSONDecodeError:
-                print("Ошибка декодирования JSON. Файл поврежден или пуст.")
-
-    def save_books(self):
+        if not os.path.exists(self.storage_file):
+            return
+        try:
+            with open(self.storage_file, 'rb') as file:
+                if self.mode == "jsonl":
+                    records = [orjson.loads(line) for line in file if line.strip()]
+                elif os.path.getsize(self.storage_file):
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        records = orjson.loads(memoryview(mm))
+                else:
+                    records = []
+        except orjson.JSONDecodeError:
+            print("Ошибка декодирования JSON. Файл поврежден или пуст.")
+            return
+        self.books = {book.id: book for book in map(Book.from_dict, records)}
+        self._reindex()
+        self._version += 1
+
+    def _reindex(self):
+        """
+        Перестроение всех индексов по текущим книгам.
+        """
+        self._by_year = {}
+        self._by_author_lc = {}
+        for book in self.books.values():
+            self._by_year.setdefault(book.year, []).append(book)
+            self._by_author_lc.setdefault(book._author_lc, []).append(book)
+        self._years = None
+        self._max_id = max(self.books, default=0)
+
+    def save_books(self, pretty: bool = False):
         """
         Сохранение данных о книгах в файл.
+
+        Внутри блока batch() запись откладывается до выхода из блока.
+
+        Args:
+            pretty (bool, optional): Записать JSON с отступами для чтения
+                человеком. По умолчанию компактный формат: меньше байт
+                и быстрее сериализация.
         """
-        with open(self.storage_file, 'w', encoding='utf-8') as file:
-            json.dump([book.to_dict() for book in self.books], file, ensure_ascii=False, indent=4)
+        if self._batch_depth:
+            self._dirty = True
+            return
+        if self.mode == "jsonl":
+            payload = b"".join(orjson.dumps(book._raw) + b"\n" for book in self.books.values())
+        else:
+            option = orjson.OPT_INDENT_2 if pretty else 0
+            payload = orjson.dumps([book._raw for book in self.books.values()], option=option)
+        tmp_file = self.storage_file + ".tmp"
+        with open(tmp_file, 'wb') as file:
+            file.write(payload)
+        os.replace(tmp_file, self.storage_file)
 
     def add_book(self, title: str, author: str, year: int):
         """
@@ -110,8 +284,43 @@ class Library:
         """
         new_id = self._generate_id()
         new_book = Book(title, author, year, new_id)
-        self.books.append(new_book)
-        self.save_books()
+        self.books[new_id] = new_book
+        self._by_year.setdefault(year, []).append(new_book)
+        self._by_author_lc.setdefault(new_book._author_lc, []).append(new_book)
+        self._years = None
+        self._version += 1
+        if self.mode == "jsonl" and not self._batch_depth:
+            with open(self.storage_file, 'ab') as file:
+                file.write(orjson.dumps(new_book._raw) + b"\n")
+        else:
+            self.save_books()
+
+    def add_books(self, records: Iterable[Tuple[str, str, int]]):
+        """
+        Массовое добавление книг с однократной записью в файл.
+
+        Args:
+            records (Iterable[Tuple[str, str, int]]): Кортежи (название, автор, год).
+        """
+        with self.batch():
+            for title, author, year in records:
+                self.add_book(title, author, year)
+
+    @contextmanager
+    def batch(self):
+        """
+        Контекстный менеджер, откладывающий сохранение до выхода из блока.
+
+        Все изменения внутри блока записываются в файл одной операцией.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._dirty:
+                self._dirty = False
+                self.save_books()
 
     def remove_book(self, book_id: int):
         """
@@ -120,9 +329,16 @@ class Library:
         Args:
             book_id (int): Идентификатор книги.
         """
-        book = self.find_book_by_id(book_id)
+        book = self.books.pop(book_id, None)
         if book:
-            self.books.remove(book)
+            self._by_year[book.year].remove(book)
+            if not self._by_year[book.year]:
+                del self._by_year[book.year]
+            self._by_author_lc[book._author_lc].remove(book)
+            if not self._by_author_lc[book._author_lc]:
+                del self._by_author_lc[book._author_lc]
+            self._years = None
+            self._version += 1
             self.save_books()
         else:
             print(f"Книга с ID {book_id} не найдена.")
@@ -137,10 +353,7 @@ class Library:
         Returns:
             Optional[Book]: Найденная книга или None.
         """
-        for book in self.books:
-            if book.id == book_id:
-                return book
-        return None
+        return self.books.get(book_id)
 
     def find_books(self, title: Optional[str] = None, author: Optional[str] = None, year: Optional[int] = None) -> List[Book]:
         """
@@ -154,14 +367,52 @@ class Library:
         Returns:
             List[Book]: Список найденных книг.
         """
-        result = self.books
-        if title:
-            result = [book for book in result if title.lower() in book.title.lower()]
-        if author:
-            result = [book for book in result if author.lower() in book.author.lower()]
-        if year:
-            result = [book for book in result if book.year == year]
-        return result
+        title_lc = title.lower() if title is not None else None
+        author_lc = author.lower() if author is not None else None
+        if year is not None:
+            if _HAS_NUMBA and len(self.books) >= _NUMBA_MIN_BOOKS:
+                all_books = list(self.books.values())
+                if self._years is None:
+                    self._years = np.array([book.year for book in all_books], dtype=np.int64)
+                mask = _year_mask(self._years, year)
+                candidates = [all_books[i] for i in np.nonzero(mask)[0]]
+            else:
+                candidates = self._by_year.get(year, [])
+            scanner = _find_scanner(title_lc is not None, author_lc is not None, False)
+            return scanner(candidates, title_lc, author_lc, None)
+        if author_lc is not None:
+            candidates = [book for key, bucket in self._by_author_lc.items()
+                          if author_lc in key for book in bucket]
+            scanner = _find_scanner(title_lc is not None, False, False)
+            return scanner(candidates, title_lc, None, None)
+        if title_lc is not None:
+            return _find_scanner(True, False, False)(self.books.values(), title_lc, None, None)
+        return list(self.books.values())
+
+    def find_books_cached(self, title: Optional[str] = None, author: Optional[str] = None, year: Optional[int] = None) -> List[Book]:
+        """
+        Поиск книг с кешированием повторяющихся запросов.
+
+        Результаты кешируются по нормализованному запросу и версии
+        библиотеки; после любой мутации кеш прозрачно устаревает.
+
+        Args:
+            title (Optional[str]): Название книги.
+            author (Optional[str]): Автор книги.
+            year (Optional[int]): Год издания книги.
+
+        Returns:
+            List[Book]: Список найденных книг.
+        """
+        ids = _find_cached(
+            self._ref,
+            self._version,
+            title.lower() if title is not None else None,
+            author.lower() if author is not None else None,
+            year,
+        )
+        books = self.books
+        return [books[book_id] for book_id in ids if book_id in books]
 
     def list_books(self) -> List[Book]:
         """
@@ -170,7 +421,7 @@ class Library:
         Returns:
             List[Book]: Список всех книг.
         """
-        return self.books
+        return list(self.books.values())
 
     def change_status(self, book_id: int, new_status: str):
         """
@@ -180,9 +431,13 @@ class Library:
             book_id (int): Идентификатор книги.
             new_status (str): Новый статус книги.
         """
+        if new_status not in (STATUS_AVAILABLE, STATUS_ISSUED):
+            print(f"Неверный статус: {new_status}.")
+            return
         book = self.find_book_by_id(book_id)
         if book:
-            book.status = new_status
+            book.set_status(new_status)
+            self._version += 1
             self.save_books()
         else:
             print(f"Книга с ID {book_id} не найдена.")
@@ -194,9 +449,21 @@ class Library:
         Returns:
             int: Уникальный идентификатор.
         """
-        if self.books:
-            return max(book.id for book in self.books) + 1
-        return 1
+        self._max_id += 1
+        return self._max_id
+
+def print_books(books: List[Book]):
+    """
+    Вывод списка книг одной операцией записи в stdout.
+
+    Args:
+        books (List[Book]): Книги для вывода.
+    """
+    out = "\n".join(
+        f"ID: {book.id}, Название: {book.title}, Автор: {book.author}, Год: {book.year}, Статус: {book.status}"
+        for book in books
+    )
+    sys.stdout.write(out + "\n")
 
 def main():
     """
@@ -205,13 +472,8 @@ def main():
     library = Library("library.json")
 
     while True:
-        print("\nМеню:")
-        print("1. Добавить книгу")
-        print("2. Удалить книгу")
-        print("3. Найти книгу")
-        print("4. Показать все книги")
-        print("5. Изменить статус книги")
-        print("6. Выход")
+        sys.stdout.write(MENU)
+        sys.stdout.flush()
 
         choice = input("Выберите действие: ")
 
@@ -240,18 +502,15 @@ def main():
                 continue
 
             if books:
-                for book in books:
-                    print(f"ID: {book.id}, Название: {book.title}, Автор: {book.author}, Год: {book.year}, Статус: {book.status}")
+                print_books(books)
             else:
                 print("Книги не найдены.")
         elif choice == "4":
-            books = library.list_books()
-            for book in books:
-                print(f"ID: {book.id}, Название: {book.title}, Автор: {book.author}, Год: {book.year}, Статус: {book.status}")
+            print_books(library.list_books())
         elif choice == "5":
             book_id = int(input("Введите ID книги: "))
             new_status = input("Введите новый статус книги (в наличии/выдана): ").strip().lower()
-            if new_status in ["в наличии", "выдана"]:
+            if new_status in (STATUS_AVAILABLE, STATUS_ISSUED):
                 library.change_status(book_id, new_status)
                 print("Статус книги обновлен.")
             else: